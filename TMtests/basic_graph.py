@@ -1,59 +1,46 @@
-import csv
 import argparse
 import numpy as np
+import pandas as pd
 from matplotlib import pyplot as plt
 
-def get_groups(filename):
-    f = open(filename, 'r')
-    reader = csv.reader(f)
-    header_row = next(reader)
-    groups = []
-    for row in reader:
-        group = (row[0], row[1], row[4])
-        if not group in groups:
-            groups.append(group)
-    f.close()
-    return groups
+DTYPES = {'tm_value': 'category',
+          'board_size': 'category',
+          'komi': 'category',
+          'winner': 'category',
+          'margin': 'float32'}
+KEYS = ['tm_value', 'board_size', 'komi']
 
-def get_balance(filename, group):
-    f = open(filename, 'r')
-    reader = csv.reader(f)
-    header_row = next(reader)
-    a, b, c = group
+def collect_balances(filename, chunksize=1 << 19):
+    # Aggregate each chunk separately, then fold the partial sums/mins/maxes
+    # together so only one chunk plus the per-group stats is held in memory.
+    partials = []
+    orders = []
+    for chunk in pd.read_csv(filename, dtype=DTYPES, chunksize=chunksize):
+        partials.append(chunk.groupby(KEYS + ['winner'], observed=True, sort=False)['margin']
+                             .agg(['sum', 'min', 'max', 'count']))
+        orders.append(chunk[KEYS].drop_duplicates().astype(str))
+    # margin is read as float32 to halve the scan; the per-chunk sums are
+    # widened before they are folded so the totals don't lose precision.
+    stats = pd.concat(partials) \
+              .astype({'sum': 'float64'}) \
+              .groupby(level=KEYS + ['winner'], sort=False) \
+              .agg({'sum': 'sum', 'min': 'min', 'max': 'max', 'count': 'sum'}) \
+              .unstack('winner') \
+              .reindex(columns=['Black', 'White'], level='winner')
+    # unstack sorts the index; restore the order groups appear in the file.
+    order = pd.MultiIndex.from_frame(pd.concat(orders).drop_duplicates())
+    stats = stats.reindex(order)
+    count = stats['count'].sum(axis=1)
+    b_wins = stats['count']['Black'].fillna(0)
+    table = pd.DataFrame({
+        'pct': (b_wins / count * 100).round(1),
+        'b_margins': stats['sum']['Black'].fillna(0) / count,
+        'b_range': (stats['max']['Black'] - stats['min']['Black']).fillna(0),
+        'w_margins': stats['sum']['White'].fillna(0) / count,
+        'w_range': (stats['max']['White'] - stats['min']['White']).fillna(0),
+    })
+    return table
 
-    b_wins = 0
-    b_margins = 0
-    b_range = [9999,0]
-    w_margins = 0
-    w_range = [9999,0]
-
-    count = 0
-    for row in reader:
-        if row[0] != a or row[1] != b or row[4] != c:
-            continue
-        if row[2] == 'Black':
-            b_wins += 1
-            b_margins += float(row[3])
-            if float(row[3]) < b_range[0]:
-                b_range[0] = float(row[3])
-            if float(row[3]) > b_range[1]:
-                b_range[1] = float(row[3])
-        else:
-            w_margins += float(row[3])
-            if float(row[3]) < w_range[0]:
-                w_range[0] = float(row[3])
-            if float(row[3]) > w_range[1]:
-                w_range[1] = float(row[3])
-        count += 1
-    pct = b_wins/count
-    b_margins = b_margins/count
-    b_range = b_range[1] - b_range[0]
-    w_margins = w_margins/count
-    w_range = w_range[1] - w_range[0]
-    f.close()
-    return [round(pct*100,1), b_margins, b_range, w_margins, w_range]
-
-        
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--csv-path', type=str, required=True)
@@ -72,11 +59,7 @@ def main():
     if not args.savepath.endswith('.png'):
         args.savepath = args.savepath+'.png'
     filename = args.csv_path
-    groups = get_groups(filename)
-    balances = []
-    for group in groups:
-        balance = get_balance(filename, group)
-        balances.append(balance) 
+    balances = collect_balances(filename)
 
     labels = ['black wins\nper 100 games',
               'average\nblack win\nmargin',
@@ -87,10 +70,13 @@ def main():
     width = 0.08
     fig, ax = plt.subplots(figsize=(24,16))
 
-    for i in range(len(groups)):
-        offset = width/len(groups)*i*10
-        name = 'tm=%s bs=%s k=%s' %(groups[i][0],groups[i][1],groups[i][2])
-        rects = ax.bar(x-offset+0.35, balances[i], width, label=name)
+    # Rows are plotted straight off the aggregated table; only the number
+    # of groups is needed up front, for the bar offsets.
+    num_groups = len(balances)
+    for i, (group, balance) in enumerate(zip(balances.index, balances.values)):
+        offset = width/num_groups*i*10
+        name = 'tm=%s bs=%s k=%s' %(group[0],group[1],group[2])
+        rects = ax.bar(x-offset+0.35, balance, width, label=name)
         autolabel(rects)
 
     ax.set_xticks(x)
@@ -1,10 +1,69 @@
 import csv
 import h5py
 import argparse
+import numpy as np
+import multiprocessing as mp
 
 from tmcode.board import Player, GameState
-from tmcode.bots.predict import load_bot
+from tmcode.bots.predict import load_bot, configure_tensorflow
 from tmcode.bots.randombot import FastRandomBot
+from tmcode import playout
+
+bots = None
+
+def init_worker(bot_path, quantize=False, num_workers=1):
+    # Each worker builds its own bots once, so the Keras model is loaded once
+    # per process rather than once per game.
+    global bots
+    np.random.seed()
+    playout.seed(np.random.randint(2**31))
+    bots = {
+        Player.black: FastRandomBot(),
+        Player.white: FastRandomBot()
+        }
+    if bot_path.endswith('.h5'):
+        configure_tensorflow(num_workers)
+        # The network bot keeps no per-player state, so one model serves
+        # both sides.
+        with h5py.File(bot_path, 'r') as h5file:
+            bot = load_bot(h5file, quantize=quantize)
+        bots = {
+            Player.black: bot,
+            Player.white: bot
+            }
+
+def play_random(task):
+    value, board_size, komi = task
+    winner, margin, komi = playout.play_random_game(board_size, komi=komi, ThueMorse=value)
+    return value, board_size, winner, margin, komi
+
+def play_one(task):
+    value, board_size, komi = task
+    game = GameState.new_game(board_size, komi=komi, ThueMorse=value)
+    while not game.is_over():
+        bot_move = bots[game.next_player].select_move(game)
+        game.apply_move_inplace(bot_move)
+    winner, margin, komi = game.result()
+    return value, board_size, winner, margin, komi
+
+def play_batch(batch):
+    # Plays a batch of games from one test group in lockstep so every ply
+    # makes a single batched predict call instead of one per game. Both
+    # players share the bot, so games with either side to move go together.
+    bot = bots[Player.black]
+    games = [GameState.new_game(board_size, komi=komi, ThueMorse=value)
+             for value, board_size, komi in batch]
+    active = list(range(len(games)))
+    while active:
+        moves = bot.select_moves([games[i] for i in active])
+        for i, move in zip(active, moves):
+            games[i].apply_move_inplace(move)
+        active = [i for i in active if not games[i].is_over()]
+    results = []
+    for (value, board_size, komi), game in zip(batch, games):
+        winner, margin, komi = game.result()
+        results.append((value, board_size, winner, margin, komi))
+    return results
 
 def main():
     parser = argparse.ArgumentParser()
@@ -13,11 +72,18 @@ def main():
     parser.add_argument('--num-games', type=int, default=1000)
     parser.add_argument('--bot', type=str, default='random')
     parser.add_argument('--savepath', type=str, required=True)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--quantize', action='store_true')
     args = parser.parse_args()
 
     board_sizes = [int(item) for item in args.board_sizes.split(',')]
     if args.bot.endswith('.h5'):
         board_sizes = [19]
+    if args.workers is None:
+        # A network bot already keeps the machine busy through batching, and
+        # every extra worker would hold its own copy of the model.
+        args.workers = 1 if args.bot.endswith('.h5') else mp.cpu_count()
     tm_values = [int(item) for item in args.tm_values.split(',')]
     tm_values.insert(0, 0)
     total_test_groups = len(board_sizes) * len(tm_values) + len(board_sizes)
@@ -27,66 +93,46 @@ def main():
     if not args.savepath.endswith('.csv'):
         args.savepath = args.savepath + '.csv'
     csv_columns = ['tm_value', 'board_size', 'winner', 'margin', 'komi']
-    csvfile = open(args.savepath,'w')
-    writer = csv.DictWriter(csvfile, fieldnames=csv_columns)
-    writer.writeheader()
 
-    bots = {
-        Player.black: FastRandomBot(),
-        Player.white: FastRandomBot()
-        }
-
-    if args.bot.endswith('.h5'):
-        bot1 = load_bot(h5py.File(args.bot, 'r'))
-        bot2 = load_bot(h5py.File(args.bot, 'r'))
-        bots = {
-            Player.black: bot1,
-            Player.white: bot2
-            }
-
-    raw_results = {}
-    game_count = 0
-    one_pct = total_games/100
     # games without komi or Thue-Morse
-    for board_size in board_sizes:
-        for i in range(args.num_games):
-            game = GameState.new_game(board_size, komi=None)
-            while not game.is_over():
-                bot_move = bots[game.next_player].select_move(game)
-                game = game.apply_move(bot_move)
-            winner, margin, komi = game.result()
-            results = {'tm_value': 0, 
-                       'board_size': board_size, 
-                       'winner': winner, 
-                       'margin': margin, 
-                       'komi': komi}
-            writer.writerow(results)
-            game_count += 1
-            if game_count >= one_pct and game_count % one_pct == 0:
-                print('%s%% complete' %(int(game_count/one_pct)))
-
+    groups = [(0, board_size, None) for board_size in board_sizes]
     for value in tm_values:
         for board_size in board_sizes:
-            for i in range(args.num_games):
-                if value:
-                    game = GameState.new_game(board_size, komi=None, ThueMorse=value)
-                else:
-                    game = GameState.new_game(board_size, ThueMorse=value)
-                while not game.is_over():
-                    bot_move = bots[game.next_player].select_move(game)
-                    game = game.apply_move(bot_move)
-                winner, margin, komi = game.result()
-                results = {'tm_value': value, 
-                           'board_size': board_size, 
-                           'winner': winner, 
-                           'margin': margin, 
-                           'komi': komi}
-                writer.writerow(results)
-                game_count += 1
-                if game_count % one_pct == 0:
-                    print('%s%% complete' %(int(game_count/one_pct)))
+            groups.append((value, board_size, None if value else 'default'))
+    tasks = [group for group in groups for i in range(args.num_games)]
 
-    csvfile.close()
+    game_count = 0
+    one_pct = max(1, total_games // 100)
+    next_milestone = one_pct
+    with open(args.savepath, 'w', newline='', buffering=1 << 20) as csvfile, \
+            mp.Pool(args.workers, initializer=init_worker, initargs=(args.bot, args.quantize, args.workers)) as pool:
+        writer = csv.writer(csvfile)
+        writer.writerow(csv_columns)
+        if args.bot.endswith('.h5'):
+            # Batches never span groups, since komi is shared across a batch.
+            batches = [[group] * min(args.batch_size, args.num_games - i)
+                       for group in groups
+                       for i in range(0, args.num_games, args.batch_size)]
+            games = (result
+                     for batch in pool.imap(play_batch, batches)
+                     for result in batch)
+        elif playout.compiled:
+            # Random games run start to finish in the compiled playout.
+            games = pool.imap(play_random, tasks, chunksize=16)
+        else:
+            games = pool.imap(play_one, tasks, chunksize=16)
+        # Rows are written in batches rather than one writerow per game.
+        rows = []
+        for row in games:
+            rows.append(row)
+            if len(rows) >= 10000:
+                writer.writerows(rows)
+                rows.clear()
+            game_count += 1
+            if game_count == next_milestone:
+                print('%s%% complete' %(game_count * 100 // total_games), flush=True)
+                next_milestone += one_pct
+        writer.writerows(rows)
 
 if __name__ == '__main__':
     main()
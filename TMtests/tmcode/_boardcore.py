@@ -0,0 +1,193 @@
+import numpy as np
+
+# Whole-board scans (territory scoring, legal-move enumeration) and the
+# string and eye tests they are built from, as compiled kernels over a flat
+# uint8 colour grid indexed like the board's bitboards: row * stride + col,
+# with a BORDER frame around the playing area. The compiled playout uses
+# the same kernels. numba is optional; without it these run as plain Python.
+try:
+    from numba import njit
+    compiled = True
+except ImportError:
+    compiled = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+BORDER = 3
+
+# Cell status codes returned by evaluate_territory.
+BLACK_STONE = 1
+WHITE_STONE = 2
+TERRITORY_B = 3
+TERRITORY_W = 4
+DAME = 5
+
+@njit(cache=True)
+def collect_region(colors, stride, start, visited, stack, region):
+    # Flood fills the cells matching colors[start], marking them in visited
+    # and writing them to region. Returns the region size and a bitmask of
+    # the colours bordering it.
+    here = colors[start]
+    visited[start] = 1
+    stack[0] = start
+    top = 1
+    size = 0
+    borders = 0
+    while top:
+        top -= 1
+        p = stack[top]
+        region[size] = p
+        size += 1
+        for n in (p - stride, p + stride, p - 1, p + 1):
+            c = colors[n]
+            if c == here:
+                if not visited[n]:
+                    visited[n] = 1
+                    stack[top] = n
+                    top += 1
+            elif c != BORDER:
+                borders |= 1 << c
+    return size, borders
+
+@njit(cache=True)
+def count_liberties(colors, stride, start, mark, stamp, stack):
+    # Liberty count of the string at start. Its stones are marked with
+    # stamp[0] and its liberties with stamp[0] + 1, so mark never needs
+    # clearing between calls.
+    stamp[0] += 2
+    s = stamp[0]
+    here = colors[start]
+    mark[start] = s
+    stack[0] = start
+    top = 1
+    liberties = 0
+    while top:
+        top -= 1
+        p = stack[top]
+        for n in (p - stride, p + stride, p - 1, p + 1):
+            if mark[n] == s or mark[n] == s + 1:
+                continue
+            if colors[n] == EMPTY:
+                mark[n] = s + 1
+                liberties += 1
+            elif colors[n] == here:
+                mark[n] = s
+                stack[top] = n
+                top += 1
+    return liberties
+
+@njit(cache=True)
+def evaluate_territory(colors, stride):
+    n = colors.shape[0]
+    status = np.zeros(n, np.uint8)
+    visited = np.zeros(n, np.uint8)
+    stack = np.empty(n, np.int64)
+    region = np.empty(n, np.int64)
+    for p in range(n):
+        c = colors[p]
+        if c == BLACK:
+            status[p] = BLACK_STONE
+        elif c == WHITE:
+            status[p] = WHITE_STONE
+        elif c == EMPTY and not visited[p]:
+            size, borders = collect_region(colors, stride, p, visited, stack, region)
+            if borders == 1 << BLACK:
+                fill = TERRITORY_B
+            elif borders == 1 << WHITE:
+                fill = TERRITORY_W
+            else:
+                fill = DAME
+            for i in range(size):
+                status[region[i]] = fill
+    return status
+
+@njit(cache=True)
+def string_liberties(colors, stride):
+    # Liberty count of the string through every stone, 0 elsewhere.
+    n = colors.shape[0]
+    liberties = np.zeros(n, np.int64)
+    visited = np.zeros(n, np.uint8)
+    counted = np.zeros(n, np.int64)
+    stack = np.empty(n, np.int64)
+    region = np.empty(n, np.int64)
+    for p in range(n):
+        c = colors[p]
+        if (c == BLACK or c == WHITE) and not visited[p]:
+            size, borders = collect_region(colors, stride, p, visited, stack, region)
+            # counted[q] == p + 1 marks liberty q as already seen for the
+            # string found at p.
+            count = 0
+            for i in range(size):
+                s = region[i]
+                for q in (s - stride, s + stride, s - 1, s + 1):
+                    if colors[q] == EMPTY and counted[q] != p + 1:
+                        counted[q] = p + 1
+                        count += 1
+            for i in range(size):
+                liberties[region[i]] = count
+    return liberties
+
+@njit(cache=True)
+def legal_moves(colors, stride, player):
+    # Empty points that are not self-capture for player, and whether each
+    # of them captures (only capturing moves can repeat a position).
+    n = colors.shape[0]
+    liberties = string_liberties(colors, stride)
+    candidates = np.empty(n, np.int64)
+    captures = np.zeros(n, np.uint8)
+    count = 0
+    for p in range(n):
+        if colors[p] != EMPTY:
+            continue
+        has_empty = False
+        captured = False
+        friendly_safe = False
+        for q in (p - stride, p + stride, p - 1, p + 1):
+            c = colors[q]
+            if c == EMPTY:
+                has_empty = True
+            elif c == player:
+                if liberties[q] != 1:
+                    friendly_safe = True
+            elif c != BORDER and liberties[q] == 1:
+                captured = True
+        if has_empty or captured or friendly_safe:
+            candidates[count] = p
+            captures[count] = captured
+            count += 1
+    return candidates[:count], captures[:count]
+
+@njit(cache=True)
+def is_eye(colors, stride, p, player):
+    # Whether the empty point p is an eye for player: all neighbours are
+    # player's stones and the diagonals are mostly player's too (all of
+    # them on the edge), as in Board.is_point_an_eye.
+    for q in (p - stride, p + stride, p - 1, p + 1):
+        if colors[q] != player and colors[q] != BORDER:
+            return False
+    friendly_corners = 0
+    off_board_corners = 0
+    for q in (p - stride - 1, p - stride + 1, p + stride - 1, p + stride + 1):
+        if colors[q] == BORDER:
+            off_board_corners += 1
+        elif colors[q] == player:
+            friendly_corners += 1
+    if off_board_corners > 0:
+        return off_board_corners + friendly_corners == 4
+    return friendly_corners >= 3
+
+@njit(cache=True)
+def eye_points(colors, stride, player):
+    # 1 at every empty point that is an eye for player.
+    n = colors.shape[0]
+    eyes = np.zeros(n, np.bool_)
+    for p in range(n):
+        if colors[p] == EMPTY:
+            eyes[p] = is_eye(colors, stride, p, player)
+    return eyes
@@ -1,38 +1,58 @@
-import os
 import h5py
-import tempfile
+import io
+import os
+import queue
+import threading
+from concurrent.futures import Future
 import numpy as np
+import tensorflow as tf
 from keras.models import load_model
 
 from tmcode import board
-from tmcode.board import Player, Point
+from tmcode import _boardcore
+from tmcode.board import Player
 from tmcode.encoders import base
 
-def is_point_an_eye(board, point, color):
-    if board.get(point) is not None:
-        return False
-    for neighbor in board.neighbors(point):
-        neighbor_color = board.get(neighbor)
-        if neighbor_color != color:
-            return False
-    friendly_corners = 0
-    off_board_corners = 0
-    corners = [
-        Point(point.row - 1, point.col - 1),
-        Point(point.row - 1, point.col + 1),
-        Point(point.row + 1, point.col - 1),
-        Point(point.row + 1, point.col + 1),
-    ]
-    for corner in corners:
-        if board.is_on_grid(corner):
-            corner_color = board.get(corner)
-            if corner_color == color:
-                friendly_corners += 1
-        else:
-            off_board_corners += 1
-    if off_board_corners > 0:
-        return off_board_corners + friendly_corners == 4
-    return friendly_corners >= 3
+class QuantizedModel():
+    # A Keras model converted to a TFLite model with int8 weights and
+    # activations, calibrated on representative_states. Called like the
+    # Keras model on a float32 batch; returns a float32 array.
+    def __init__(self, model, representative_states):
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: (
+            [state[np.newaxis].astype(np.float32)] for state in representative_states)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+        self.interpreter = tf.lite.Interpreter(model_content=converter.convert())
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    def __call__(self, input_tensor):
+        in_scale, in_zero = self._input['quantization']
+        out_scale, out_zero = self._output['quantization']
+        quantized = np.clip(np.round(input_tensor / in_scale + in_zero), -128, 127).astype(np.int8)
+        outputs = []
+        # The converted model has a batch size of one.
+        for sample in quantized:
+            self.interpreter.set_tensor(self._input['index'], sample[np.newaxis])
+            self.interpreter.invoke()
+            outputs.append(self.interpreter.get_tensor(self._output['index'])[0])
+        return (np.array(outputs, dtype=np.float32) - out_zero) * out_scale
+
+def representative_states(encoder, num_states=200):
+    # Encoded positions from random games, for calibrating quantization.
+    from tmcode.bots.randombot import FastRandomBot
+    bot = FastRandomBot()
+    states = []
+    while len(states) < num_states:
+        game = board.GameState.new_game((encoder.board_height, encoder.board_width))
+        while not game.is_over() and len(states) < num_states:
+            states.append(encoder.encode(game))
+            game = game.apply_move(bot.select_move(game))
+    return states
 
 
 class TestNN():
@@ -40,6 +60,18 @@ class TestNN():
         self.model = model
         self.encoder = encoder
         self.own_color = "black" if self == Player.black else "white"
+        # predict encodes straight into this batch of one.
+        self._input_buf = np.zeros((1,) + tuple(encoder.shape()), dtype=np.float32)
+        self._rng = np.random.default_rng()
+        # The model is called through one traced graph with a fixed input
+        # signature, instead of Model.predict, which sets up callbacks and
+        # a data adapter on every call.
+        if isinstance(model, QuantizedModel):
+            self._infer = model
+        else:
+            self._infer = tf.function(
+                lambda x: self.model(x, training=False),
+                input_signature=[tf.TensorSpec((None,) + tuple(encoder.shape()), tf.float32)])
 
     def should_pass(self, game_state):
         if game_state.last_move and game_state.last_move.is_pass:
@@ -47,32 +79,124 @@ class TestNN():
         return False
 
     def predict(self, game_state):
-        encoded_state = self.encoder.encode(game_state)
-        input_tensor = np.array([encoded_state])
-        return self.model.predict(input_tensor)[0]
+        self.encoder.encode(game_state, out=self._input_buf[0])
+        return np.asarray(self._infer(self._input_buf))[0]
+
+    def predict_batch(self, game_states):
+        input_tensor = np.empty((len(game_states),) + tuple(self.encoder.shape()),
+                                dtype=np.float32)
+        for g, encoded_state in zip(game_states, input_tensor):
+            self.encoder.encode(g, out=encoded_state)
+        return np.asarray(self._infer(input_tensor))
 
     def select_move(self, game_state):
         if self.should_pass(game_state):
             return board.Move.pass_turn()
+        return self.choose_move(game_state, self.predict(game_state))
+
+    def select_moves(self, game_states):
+        # One forward pass for every state that needs the network.
+        moves = [board.Move.pass_turn() for _ in game_states]
+        to_predict = [i for i, g in enumerate(game_states) if not self.should_pass(g)]
+        if to_predict:
+            all_probs = self.predict_batch([game_states[i] for i in to_predict])
+            for i, move_probs in zip(to_predict, all_probs):
+                moves[i] = self.choose_move(game_states[i], move_probs)
+        return moves
+
+    def choose_move(self, game_state, move_probs):
         num_moves = self.encoder.board_width * self.encoder.board_height
-        move_probs = self.predict(game_state)
 
-        move_probs = move_probs ** 3  
+        # Normalizing only shifts every log-probability by the same amount,
+        # so it does not change the ranking below and is skipped. The keys
+        # are built in place in float32.
         eps = 1e-6
-        move_probs = np.clip(move_probs, eps, 1 - eps)
-        move_probs = move_probs / np.sum(move_probs)
-
-        candidates = np.arange(num_moves)  
-        ranked_moves = np.random.choice(
-            candidates, num_moves, replace=False, p=move_probs) 
-        for point_idx in ranked_moves:
-            point = self.encoder.decode_point_index(point_idx)
-            if game_state.is_valid_move(board.Move.play(point)) and \
-                    not is_point_an_eye(game_state.board, point, game_state.next_player): 
-                return board.Move.play(point)
+        keys = np.array(move_probs, dtype=np.float32)
+        np.power(keys, 3, out=keys)
+        np.clip(keys, eps, 1 - eps, out=keys)
+        np.log(keys, out=keys)
+
+        # The largest log-probability perturbed by Gumbel noise is a draw
+        # from the probabilities. Illegal points and our own eyes, both
+        # found for the whole board at once, are ruled out first; only ko
+        # is left to check, and only when the drawn move captures.
+        keys += self._rng.gumbel(size=num_moves)
+        stride = game_state.board._stride
+        playable, captures = game_state.playable_mask()
+        skip = ~playable | _boardcore.eye_points(
+            game_state.board.colors(), stride, game_state.next_player)
+        skip = skip.reshape(-1, stride)[1:-1, 1:-1].ravel()
+        keys[skip] = -np.inf
+        while True:
+            point_idx = int(np.argmax(keys))
+            if keys[point_idx] == -np.inf:
+                break
+            idx = (point_idx // self.encoder.board_width + 1) * stride + \
+                point_idx % self.encoder.board_width + 1
+            move = board.Move.play(self.encoder.decode_point_index(point_idx))
+            if captures[idx] and \
+                    game_state.does_move_violate_ko(game_state.next_player, move):
+                keys[point_idx] = -np.inf
+                continue
+            return move
         return board.Move.pass_turn() 
 
-def load_bot(h5file):
+class BatchedPredictor():
+    # Coalesces predict calls from games running in separate threads into
+    # one forward pass. Each call waits for its own result; the worker
+    # thread collects up to max_batch waiting states, giving up on more
+    # after timeout seconds. Games played in lockstep from one thread
+    # should call bot.select_moves instead.
+    def __init__(self, bot, max_batch=32, timeout=0.002):
+        self.bot = bot
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def predict(self, game_state):
+        future = Future()
+        self._requests.put((self.bot.encoder.encode(game_state), future))
+        return future.result()
+
+    def select_move(self, game_state):
+        if self.bot.should_pass(game_state):
+            return board.Move.pass_turn()
+        return self.bot.choose_move(game_state, self.predict(game_state))
+
+    def _run(self):
+        while True:
+            batch = [self._requests.get()]
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._requests.get(timeout=self.timeout))
+            except queue.Empty:
+                pass
+            states, futures = zip(*batch)
+            try:
+                results = np.asarray(self.bot._infer(np.array(states, dtype=np.float32)))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+def configure_tensorflow(num_processes=1):
+    # For running the network in several processes at once: each process
+    # gets an equal share of the CPU threads, and claims GPU memory as it
+    # needs it instead of all of it up front. Must run before the model is
+    # loaded.
+    threads = max(1, os.cpu_count() // num_processes)
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+    for gpu in tf.config.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+def load_bot(h5file, quantize=False):
+    # With quantize, the network runs as an int8 TFLite model: smaller and
+    # faster on CPU, at some cost in accuracy.
     model = load_model_from_hdf5_group(h5file['model'])
     encoder_name = h5file['encoder'].attrs['name']
     if not isinstance(encoder_name, str):
@@ -81,19 +205,17 @@ def load_bot(h5file):
     board_height = h5file['encoder'].attrs['board_height']
     encoder = base.get_encoder_by_name(
         encoder_name, (board_width, board_height))
+    if quantize:
+        model = QuantizedModel(model, representative_states(encoder))
     return TestNN(model, encoder)
 
 def load_model_from_hdf5_group(f, custom_objects=None):
-    tempfd, tempfname = tempfile.mkstemp(prefix='tmp-kerasmodel')
-    try:
-        os.close(tempfd)
-        serialized_model = h5py.File(tempfname, 'w')
+    # The model group is copied into an in-memory HDF5 file, which
+    # load_model reads like one on disk.
+    with h5py.File(io.BytesIO(), 'w') as serialized_model:
         root_item = f.get('kerasmodel')
         for attr_name, attr_value in root_item.attrs.items():
             serialized_model.attrs[attr_name] = attr_value
         for k in root_item.keys():
             f.copy(root_item.get(k), serialized_model, k)
-        serialized_model.close()
-        return load_model(tempfname, custom_objects=custom_objects)
-    finally:
-        os.unlink(tempfname)
+        return load_model(serialized_model, custom_objects=custom_objects)
@@ -1,57 +1,39 @@
 import numpy as np
-from tmcode.board import Point, Move
-
-def is_point_an_eye(board, point, color):
-    if board.get(point) is not None:
-        return False
-    for neighbor in board.neighbors(point):
-        neighbor_color = board.get(neighbor)
-        if neighbor_color != color:
-            return False
-    friendly_corners = 0
-    off_board_corners = 0
-    corners = [
-        Point(point.row - 1, point.col - 1),
-        Point(point.row - 1, point.col + 1),
-        Point(point.row + 1, point.col - 1),
-        Point(point.row + 1, point.col + 1),
-    ]
-    for corner in corners:
-        if board.is_on_grid(corner):
-            corner_color = board.get(corner)
-            if corner_color == color:
-                friendly_corners += 1
-        else:
-            off_board_corners += 1
-    if off_board_corners > 0:
-        return off_board_corners + friendly_corners == 4
-    return friendly_corners >= 3
+from tmcode.board import Move
 
 class FastRandomBot():
-    def __init__(self):
-        self.dim = None
-        self.point_cache = []
+    def __init__(self, pool_size=4096):
+        # Random numbers are drawn from numpy in large batches and handed
+        # out one at a time, rather than reshuffling every candidate on
+        # every move.
+        self.pool_size = pool_size
+        self._pool = []
+        self._pool_idx = 0
 
-    def _update_cache(self, dim):
-        self.dim = dim
-        rows, cols = dim
-        self.point_cache = []
-        for r in range(1, rows + 1):
-            for c in range(1, cols + 1):
-                self.point_cache.append(Point(row=r, col=c))
+    def _draw(self):
+        if self._pool_idx == len(self._pool):
+            self._pool = np.random.randint(
+                0, 1 << 32, size=self.pool_size, dtype=np.uint32).tolist()
+            self._pool_idx = 0
+        r = self._pool[self._pool_idx]
+        self._pool_idx += 1
+        return r
 
     def select_move(self, game_state):
-        dim = (game_state.board.num_rows, game_state.board.num_cols)
-        if dim != self.dim:
-            self._update_cache(dim)
-
-        idx = np.arange(len(self.point_cache))
-        np.random.shuffle(idx)
-        for i in idx:
-            p = self.point_cache[i]
-            if game_state.is_valid_move(Move.play(p)) and \
-                    not is_point_an_eye(game_state.board,
-                                        p,
-                                        game_state.next_player):
-                return Move.play(p)
+        # Only empty points can be legal, and the board lists those with
+        # one scan of its colour grid. Candidates are picked uniformly one
+        # at a time (a lazy Fisher-Yates shuffle), since the first pick is
+        # usually playable.
+        board = game_state.board
+        candidates = board.empty_indices().tolist()
+        n = len(candidates)
+        while n:
+            j = self._draw() % n
+            i = candidates[j]
+            n -= 1
+            candidates[j] = candidates[n]
+            move = Move.play(board.point_from_index(i))
+            if game_state.is_valid_move(move) and \
+                    not board._is_point_an_eye(game_state.next_player, i):
+                return move
         return Move.pass_turn()
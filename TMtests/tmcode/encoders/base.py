@@ -4,7 +4,7 @@ class Encoder:
     def name(self):  
         raise NotImplementedError()
 
-    def encode(self, game_state): 
+    def encode(self, game_state, out=None): 
         raise NotImplementedError()
 
     def encode_point(self, point): 
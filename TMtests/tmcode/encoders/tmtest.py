@@ -1,6 +1,7 @@
 import numpy as np
 from tmcode.encoders.base import Encoder
-from tmcode.board import Point, Player, Move
+from tmcode import _boardcore
+from tmcode.board import Move, Point, Player
 
 # Channel 0 represents the current player's stone color.
 # Channel 1 represents black and white stones.
@@ -9,73 +10,79 @@ from tmcode.board import Point, Player, Move
 # Channel 4 represents number of own stones in atari if played.
 # Channel 5 represents number of opponent stones captured if played.
 
+# Channel 1 value for each _boardcore colour code.
+STONE_SIGN = np.array([0, 1, -1, 0])
+
+# Channels 3-5 as capped counts, keyed by position, player to move and
+# board size. Oldest entries are evicted first once the cache is full.
+MOVE_COUNTS_CACHE_SIZE = 1 << 14
+_move_counts_cache = {}
+
 class TMTestEncoder(Encoder):
     def __init__(self, board_size):
         self.board_width, self.board_height = board_size
         self.num_planes = 6
+        self._points_by_index = tuple(
+            Point(row=i // self.board_width + 1, col=i % self.board_width + 1)
+            for i in range(self.board_width * self.board_height))
 
     def name(self):
         return 'tmtest'
 
-    def encode(self, game_state):
-        board_tensor = np.zeros(self.shape())        
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-                p = Point(row=row + 1, col=col + 1)
-                go_string = game_state.board.get_go_string(p)
-                move = Move.play(p)
-
-                if game_state.next_player == Player.black:
-                    board_tensor[row][col][0] = 1
-                else:
-                    board_tensor[row][col][0] = -1              
+    def encode(self, game_state, out=None):
+        # Writes into out, an array of self.shape(), when one is given.
+        board = game_state.board
+        if out is None:
+            board_tensor = np.zeros(self.shape())
+        else:
+            board_tensor = out
+        # Channels 0-2 are read off the colour grid and the liberty count of
+        # the string through each stone in one pass over the board.
+        colors = board.colors()
+        liberties = _boardcore.string_liberties(colors, board._stride)
+        inner = (slice(1, self.board_height + 1), slice(1, self.board_width + 1))
+        colors = colors.reshape(-1, board._stride)[inner]
+        liberties = liberties.reshape(-1, board._stride)[inner]
+        board_tensor[:, :, 0] = 1 if game_state.next_player == Player.black else -1
+        board_tensor[:, :, 1] = STONE_SIGN[colors]
+        board_tensor[:, :, 2] = np.minimum(liberties, 10) / 10
 
-                if go_string:                                            
-                    if go_string.color == Player.black:
-                        board_tensor[row][col][1] = 1
-                    else:
-                        board_tensor[row][col][1] = -1
-                    
-                    if go_string.num_liberties < 10:
-                        board_tensor[row][col][2] = go_string.num_liberties / 10
-                    else:
-                        board_tensor[row][col][2] = 1
-                
-                if game_state.is_valid_move(move):
-                      new_state = game_state.apply_move(move)
-                      new_string = new_state.board.get_go_string(p)
-                      if new_string.num_liberties < 10:
-                        board_tensor[row][col][3] = new_string.num_liberties / 10
-                      else:
-                          board_tensor[row][col][3] = 1
-                      
-                      if new_string.num_liberties == 1:
-                          if len(new_string.stones) < 10:                      
-                              board_tensor[row][col][4] = len(new_string.stones) / 10
-                          else:
-                              board_tensor[row][col][4] = 1
-
-                      adjacent_strings = [game_state.board.get_go_string(nb)  
-                                        for nb in p.neighbors()]            #<8>
-                      capture_count = 0
-                      for s in adjacent_strings:
-                          other_p = game_state.next_player.other
-                          if s and s.num_liberties == 1 and s.color == other_p:
-                              capture_count += len(s.stones)
-                      if capture_count < 10:                   
-                          board_tensor[row][col][5] = capture_count / 10
-                      else:             
-                          board_tensor[row][col][5] = 1
+        # Channels 3-5 only depend on the position, apart from ko, so they
+        # are cached by position; a capture is the only move ko can rule
+        # out, and those are checked against this game's history each time.
+        if not game_state.is_over():
+            player = game_state.next_player
+            key = (board.zobrist_hash(), player, board.num_rows, board.num_cols)
+            counts = _move_counts_cache.get(key)
+            if counts is None:
+                counts = self.move_counts(board, player, inner)
+                if len(_move_counts_cache) >= MOVE_COUNTS_CACHE_SIZE:
+                    _move_counts_cache.pop(next(iter(_move_counts_cache)))
+                _move_counts_cache[key] = counts
+            board_tensor[:, :, 3:] = counts / 10
+            for row, col in np.argwhere(counts[:, :, 2]).tolist():
+                move = Move.play(self._points_by_index[row * self.board_width + col])
+                if game_state.does_move_violate_ko(player, move):
+                    board_tensor[row, col, 3:] = 0
+        elif out is not None:
+            board_tensor[:, :, 3:] = 0
 
         return board_tensor
 
+    def move_counts(self, board, player, inner):
+        # For every empty point where player could play, ko aside: the
+        # liberties of the resulting string, its stones if that leaves it
+        # in atari, and the opponent stones captured, each capped at 10.
+        probed = board.probe_moves(player).reshape(-1, board._stride, 3)[inner]
+        counts = np.minimum(probed, 10).astype(np.uint8)
+        counts[:, :, 1][probed[:, :, 0] != 1] = 0
+        return counts
+
     def encode_point(self, point):
         return self.board_width * (point.row - 1) + (point.col - 1)
 
     def decode_point_index(self, index):
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
+        return self._points_by_index[index]
 
     def num_points(self):
         return self.board_width * self.board_height
@@ -0,0 +1,193 @@
+import numpy as np
+
+from tmcode import _boardcore
+from tmcode._boardcore import njit, compiled, collect_region, count_liberties, is_eye, \
+    EMPTY, BLACK, WHITE
+from tmcode.board import GameResult, EMPTY_BOARD, bit_tables, init_bit_table, \
+    resolve_komi, thue_morse_sequence
+
+# Compiled random-bot playouts for setmaker. Random games are pure Python
+# method dispatch from start to finish, so the whole game is played here on
+# the board's flat uint8 colour grid instead: the same rules as GameState
+# (situational superko checked on captures, Thue-Morse turn order, area
+# scoring) and the same move choice as FastRandomBot. The string walks,
+# eye test and scoring are _boardcore's, and positions are hashed with the
+# board's own Zobrist toggles. As in _boardcore, numba is optional; without
+# it the functions below run as plain Python, which is slower than
+# GameState.
+
+@njit(cache=True)
+def seed(value):
+    # numba keeps its own generator state, separate from numpy's.
+    np.random.seed(value)
+
+@njit(cache=True)
+def collect_string(colors, stride, start, visited, stack, region):
+    # The stones of the string at start, written to region; returns how
+    # many. visited is clear again on return.
+    size, borders = collect_region(colors, stride, start, visited, stack, region)
+    for i in range(size):
+        visited[region[i]] = 0
+    return size
+
+@njit(cache=True)
+def string_hash(toggles, region, size, color):
+    # XOR of the toggles of the first size stones in region.
+    h = np.uint64(0)
+    for i in range(size):
+        h ^= toggles[region[i] * 3 + color]
+    return h
+
+@njit(cache=True)
+def is_self_capture(colors, stride, point, player, mark, stamp, stack):
+    # An empty neighbour settles it before any string is walked.
+    for n in (point - stride, point + stride, point - 1, point + 1):
+        if colors[n] == EMPTY:
+            return False
+    friendly_liberties_left = False
+    for n in (point - stride, point + stride, point - 1, point + 1):
+        c = colors[n]
+        if c != BLACK and c != WHITE:
+            continue
+        liberties = count_liberties(colors, stride, n, mark, stamp, stack)
+        if c == player:
+            if liberties != 1:
+                friendly_liberties_left = True
+        elif liberties == 1:
+            return False
+    return not friendly_liberties_left
+
+@njit(cache=True)
+def hash_after(colors, stride, point, player, h, toggles, buffers):
+    # The position hash after playing at point, and whether it captures.
+    mark, stamp, visited, stack, region = buffers
+    other = BLACK + WHITE - player
+    h ^= toggles[point * 3 + player]
+    captured = np.zeros(4, np.uint64)
+    num_captured = 0
+    for n in (point - stride, point + stride, point - 1, point + 1):
+        if colors[n] != other:
+            continue
+        if count_liberties(colors, stride, n, mark, stamp, stack) != 1:
+            continue
+        # Two neighbours can belong to the same string; strings are disjoint
+        # so equal hashes mean the same string.
+        size = collect_string(colors, stride, n, visited, stack, region)
+        string = string_hash(toggles, region, size, other)
+        if string in captured[:num_captured]:
+            continue
+        captured[num_captured] = string
+        num_captured += 1
+        h ^= string
+    return h, num_captured > 0
+
+@njit(cache=True)
+def play(colors, stride, point, player, h, toggles, buffers):
+    mark, stamp, visited, stack, region = buffers
+    other = BLACK + WHITE - player
+    colors[point] = player
+    h ^= toggles[point * 3 + player]
+    for n in (point - stride, point + stride, point - 1, point + 1):
+        if colors[n] != other:
+            continue
+        if count_liberties(colors, stride, n, mark, stamp, stack) == 0:
+            size = collect_string(colors, stride, n, visited, stack, region)
+            h ^= string_hash(toggles, region, size, other)
+            for i in range(size):
+                colors[region[i]] = EMPTY
+    return h
+
+@njit(cache=True)
+def area_score(colors, stride):
+    # Stones plus empty regions bordered by a single colour.
+    status = _boardcore.evaluate_territory(colors, stride)
+    black = 0
+    white = 0
+    for s in status:
+        if s == _boardcore.BLACK_STONE or s == _boardcore.TERRITORY_B:
+            black += 1
+        elif s == _boardcore.WHITE_STONE or s == _boardcore.TERRITORY_W:
+            white += 1
+    return black, white
+
+@njit(cache=True)
+def random_playout(colors, stride, thue_morse, toggles, empty_hash):
+    # Plays out the empty board colors in place. thue_morse is the turn
+    # schedule from thue_morse_sequence, empty for a normal game.
+    mark = np.zeros(colors.shape[0], np.int64)
+    stamp = np.zeros(1, np.int64)
+    visited = np.zeros(colors.shape[0], np.uint8)
+    stack = np.empty(colors.shape[0], np.int64)
+    region = np.empty(colors.shape[0], np.int64)
+    buffers = (mark, stamp, visited, stack, region)
+    candidates = np.empty(colors.shape[0], np.int64)
+    # The positions seen with each player to move.
+    seen_black = {np.uint64(0)}
+    seen_black.clear()
+    seen_white = {np.uint64(0)}
+    seen_white.clear()
+    h = empty_hash
+    player = BLACK
+    turn = 0
+    in_thue_morse = len(thue_morse) > 0
+    passes = 0
+    while passes < 2:
+        if player == BLACK:
+            seen_black.add(h)
+        else:
+            seen_white.add(h)
+        num_candidates = 0
+        for p in range(colors.shape[0]):
+            if colors[p] == EMPTY:
+                candidates[num_candidates] = p
+                num_candidates += 1
+        # Candidates are drawn one at a time (a lazy Fisher-Yates shuffle),
+        # since the first pick is usually playable.
+        move = -1
+        while num_candidates:
+            j = np.random.randint(0, num_candidates)
+            p = candidates[j]
+            num_candidates -= 1
+            candidates[j] = candidates[num_candidates]
+            if is_self_capture(colors, stride, p, player, mark, stamp, stack):
+                continue
+            next_h, captures = hash_after(
+                colors, stride, p, player, h, toggles, buffers)
+            if captures:
+                seen = seen_black if player == WHITE else seen_white
+                if next_h in seen:
+                    continue
+            if is_eye(colors, stride, p, player):
+                continue
+            move = p
+            break
+        if move < 0:
+            passes += 1
+        else:
+            passes = 0
+            h = play(colors, stride, move, player, h, toggles, buffers)
+        player = BLACK + WHITE - player
+        if in_thue_morse:
+            if turn + 1 != len(thue_morse):
+                turn += 1
+                player = BLACK if thue_morse[turn] == 0 else WHITE
+            else:
+                in_thue_morse = False
+    return area_score(colors, stride)
+
+def play_random_game(board_size, komi='default', ThueMorse=None):
+    # Same arguments as GameState.new_game; returns what GameState.result
+    # would for a game between two FastRandomBots.
+    if isinstance(board_size, int):
+        board_size = (board_size, board_size)
+    komi = resolve_komi(board_size, komi)
+    if board_size not in bit_tables:
+        init_bit_table(board_size)
+    empty_colors, toggles = bit_tables[board_size][6:8]
+    b, w = random_playout(np.frombuffer(empty_colors, dtype=np.uint8).copy(),
+                          board_size[1] + 2,
+                          thue_morse_sequence(ThueMorse or 0),
+                          np.frombuffer(toggles, dtype=np.uint64),
+                          np.uint64(EMPTY_BOARD))
+    game_result = GameResult(b, w, komi=komi)
+    return game_result.winner, game_result.winning_margin, komi
@@ -1,7 +1,7 @@
 import argparse
 
 from tmcode.bots.randombot import FastRandomBot
-from tmcode.board import Point, Player, GameState
+from tmcode.board import Point, Player, GameState, PLAYER_NAMES
 
 COLS = 'ABCDEFGHJKLMNOPQRST'
 STONE_TO_CHAR = {
@@ -17,7 +17,7 @@ def print_move(player, move):
         move_str = 'resigns'
     else:
         move_str = '%s%d' % (COLS[move.point.col - 1], move.point.row)
-    print('%s %s' % (player, move_str))
+    print('%s %s' % (PLAYER_NAMES[player], move_str))
 
 
 def print_board(board):
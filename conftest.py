@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The tests import gostuff from the repository root, and tmcode from
+# TMtests, the directory its scripts are run from.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for path in (ROOT, os.path.join(ROOT, 'TMtests')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -1,7 +1,6 @@
 from gostuff import goboard
 from gostuff.agents.base import Agent
 from gostuff import scoring
-from gostuff.gotypes import Player
 
 # Adapted from https://github.com/maxpumperla/deep_learning_and_the_game_of_go/blob/master/code/dlgo/agent/termination.py
 
@@ -19,28 +18,30 @@ class TerminationStrategy:
 class PassWhenOpponentPasses(TerminationStrategy):
 
     def should_pass(self, game_state):
-        if game_state.last_move is not None:
-            return True if game_state.last_move.is_pass else False
+        return game_state.last_move is not None and game_state.last_move.is_pass
 
 class ResignLargeMargin(TerminationStrategy):
 
     def __init__(self):
         TerminationStrategy.__init__(self)
-        self.own_color = "black" if self == Player.black else "white"
         self.cut_off_move = 160
         self.margin = 90
+        # Scoring walks the whole board, so after the cut-off the game is
+        # only scored every check_interval moves.
+        self.check_interval = 10
 
         self.moves_played = 0
 
     def should_pass(self, game_state):
-        if game_state.last_move is not None:
-            return True if game_state.last_move.is_pass else False
+        return game_state.last_move is not None and game_state.last_move.is_pass
 
     def should_resign(self, game_state):
         self.moves_played += 1
-        if self.moves_played >= self.cut_off_move:
+        if self.moves_played >= self.cut_off_move and \
+                (self.moves_played - self.cut_off_move) % self.check_interval == 0:
+            # The agent asked to move plays next_player.
             game_result = scoring.compute_game_result(game_state)
-            if game_result.winner != self.own_color and game_result.winning_margin >= self.margin:
+            if game_result.winner != game_state.next_player and game_result.winning_margin >= self.margin:
                 return True
         return False
 
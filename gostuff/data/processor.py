@@ -1,12 +1,10 @@
 import os
+import uuid
 import numpy as np
-import tensorflow as tf
 import multiprocessing as mp
 
 from os import sys
-from random import choice, randint
-from functools import partial
-from tensorflow.keras.utils import to_categorical
+from random import choice, shuffle
 
 from gostuff.gosgf import Sgf_game
 from gostuff.gotypes import Player, Point
@@ -14,23 +12,82 @@ from gostuff.goboard import Board, GameState, Move
 from gostuff.encoders.base import get_encoder_by_name
 from gostuff.data.sgf_index import SGFIndex
 
-def worker(jobinfo):
+# The processor each worker process builds once, in init_worker.
+_processor = None
+
+def init_worker(clazz, size, encoder, record_directory):
+    global _processor
+    _processor = clazz(size=size, encoder=encoder, record_directory=record_directory)
+
+def worker(filename):
+    # Encodes one game and returns its samples as serialized examples, so
+    # the parent only has to frame them into the shard.
     try:
-        clazz, size, encoder, filename = jobinfo
-        features, labels = clazz(size=size, encoder=encoder).process(filename)
-        return [features, labels]
+        result = _processor.process(filename)
+        if result is None:
+            return None
+        features, labels = result
+        return [_processor.tf_example_from_nparrays(feature, label)
+                for feature, label in zip(features, labels)]
     except (KeyboardInterrupt, SystemExit):
         raise Exception('>>> Exiting child process.')
     except:
         pass
 
+def _tensorflow():
+    # The single place TensorFlow is imported, on first use by the methods
+    # that read or write records; the workers, which only encode, never
+    # call it.
+    import tensorflow
+    return tensorflow
+
+# tf.train.Example encoded by hand, so workers can serialize their samples
+# without TensorFlow. The messages used are Example {Features features = 1},
+# Features {map<string, Feature> feature = 1}, Feature {BytesList
+# bytes_list = 1; Int64List int64_list = 3} and the lists' repeated
+# value = 1, packed for int64.
+def _varint(value):
+    value &= 0xFFFFFFFFFFFFFFFF
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+def _field(number, payload):
+    # A length-delimited field: tag, length, payload.
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+def serialize_example(features):
+    # features maps names to a bytes value or a list of ints; returns the
+    # serialized tf.train.Example.
+    entries = []
+    for key, value in features.items():
+        if isinstance(value, bytes):
+            feature = _field(1, _field(1, value))
+        else:
+            feature = _field(3, _field(1, b''.join(_varint(int(v)) for v in value)))
+        entries.append(_field(1, _field(1, key.encode()) + _field(2, feature)))
+    return _field(1, b''.join(entries))
+
+# prep_data and map_to_workers encode games in worker processes started
+# from a fresh interpreter, which imports the caller's main module again:
+# scripts must call them under if __name__ == '__main__':, and a subclass
+# must be defined in a module the workers can import, not in the script.
+# Workers serialize examples without TensorFlow (see serialize_example),
+# so they never load it; the parent only frames their records into the
+# shard.
 class GoProcessor:
     def __init__(self, size=19, encoder='gogoboi', record_directory='/records'):
         self.size = size
         self.encoder_string = encoder
         self.encoder = get_encoder_by_name(encoder, self.size)
         self.record_dir = record_directory
-        self.used_games = []
+        self.used_games = set()
+        # The index list _unused_games was drawn from; see draw_data.
+        self._unused_source = None
+        self._unused_games = []
 
     def prep_data(self, data_type='train', num_samples=1000):
         index = SGFIndex(self.size)
@@ -41,70 +98,101 @@ class GoProcessor:
         if num_samples > len(index.index):
             num_samples = len(index.index)
         total = num_samples
-        while total != 0:
-            if total > 200:
-                num_samples = 200
-            else:
-                num_samples = total
-            data = self.draw_data(index, num_samples)
-            self.map_to_workers(data, data_type)
-            total -= num_samples
-            print('%s remaining' %(total))
+        # One pool of workers encodes every chunk.
+        with self.create_pool() as pool:
+            while total != 0:
+                if total > 200:
+                    num_samples = 200
+                else:
+                    num_samples = total
+                data = self.draw_data(index, num_samples)
+                self.map_to_workers(data, data_type, pool)
+                total -= num_samples
+                print('%s remaining' %(total))
 
     def draw_data(self, index, num_sample_games):
-        games = []
-        while len(games) < num_sample_games:
-            game = choice(index.index)
-            while game in self.used_games:
-                game = choice(index.index)
-            games.append(game)
-            self.used_games.append(game)
+        # Games are drawn without replacement from a shuffled list of the
+        # index's games that have not been used yet, built once per index.
+        if self._unused_source is not index.index:
+            self._unused_source = index.index
+            self._unused_games = [game for game in index.index
+                                  if game not in self.used_games]
+            shuffle(self._unused_games)
+        start = max(0, len(self._unused_games) - num_sample_games)
+        games = self._unused_games[start:]
+        del self._unused_games[start:]
+        self.used_games.update(games)
         return games
 
-    def map_to_workers(self, data, data_type):
-        jobs = []
-        for filename in data:
-            jobs.append((self.__class__, self.size, self.encoder_string, filename))
+    def create_pool(self):
+        # Workers start from a fresh interpreter rather than a fork of this
+        # one, which may already have TensorFlow's threads running.
+        if 'forkserver' in mp.get_all_start_methods():
+            context = mp.get_context('forkserver')
+        else:
+            context = mp.get_context('spawn')
+        return context.Pool(processes=mp.cpu_count(), initializer=init_worker,
+                            initargs=(self.__class__, self.size, self.encoder_string, self.record_dir))
 
-        cores = mp.cpu_count()  
-        pool = mp.Pool(processes=cores)
-        p = pool.map_async(worker, jobs)
+    def map_to_workers(self, data, data_type, pool=None):
+        # Writes the chunk's games to a single shard and returns its
+        # filename, or None if no game produced samples. The uuid keeps
+        # shards from different chunks and runs apart. Without a pool from
+        # create_pool, one is started for this chunk alone.
+        tf = _tensorflow()
+        os.makedirs(self.record_dir, exist_ok=True)
+        record_file = '%s/%s-%s.tfrec' %(self.record_dir, data_type, uuid.uuid4().hex)
+        own_pool = pool is None
+        if own_pool:
+            pool = self.create_pool()
+        cores = mp.cpu_count()
+        num_games = 0
         try:
-            results = p.get()
+            # Games are written as they finish, in any order.
+            with tf.io.TFRecordWriter(record_file) as writer:
+                for examples in pool.imap_unordered(worker, data,
+                                                    chunksize=max(1, len(data) // (4 * cores))):
+                    if examples is None:
+                        continue
+                    for example in examples:
+                        writer.write(example)
+                    num_games += 1
         except KeyboardInterrupt: 
             pool.terminate()
             pool.join()
             sys.exit(-1)
-        pool.close()
-        pool.join()
+        if own_pool:
+            pool.close()
+            pool.join()
+        if num_games == 0:
+            os.remove(record_file)
+            return None
+        return record_file
 
+    def process(self, filename):
         features = []
         labels = []
-        filename = self.record_dir+'/'+data_type+str(randint(1,9999))+'.tfrec'
-        for pair in results:
-            try:
-                for feature in pair[0]:
-                    features.append(feature)
-                for label in pair[1]:
-                    labels.append(label)
-            except:
-                continue
-        self.tf_record_from_nparrays(features, labels, filename)
-
-    def process(self, filename):
-        total_examples = self.num_total_examples(filename)
-        if not total_examples:
+        for feature, label in self.samples(filename):
+            features.append(feature)
+            labels.append(label)
+        if not features:
             return None
-        shape = self.encoder.shape()
-        feature_shape = np.insert(shape, 0, np.asarray([total_examples]))
-        features = np.zeros(feature_shape)
-        labels = np.zeros((total_examples,))
+        features = np.stack(features)
+        # Labels are point indices; train with a sparse categorical loss.
+        labels = np.asarray(labels, dtype=np.int64)
+        print(choice(['done', 'done!', 'done!!!'])) # Make sure SOMETHING is happening.
+        return features, labels
 
-        counter = 0
+    def samples(self, filename):
+        # Yields (encoded state, point index) for every move after the first
+        # one of a game without handicap. The SGF is read and parsed once;
+        # samples come out as the game is replayed.
         sgf = open(filename, 'r')
         sgf_content = sgf.read()
         sgf.close()
         sgf = Sgf_game.from_string(sgf_content)
+        if sgf.get_handicap() is not None and sgf.get_handicap() != 0:
+            return
         game_state = GameState.new_game(self.size)
         first_move_done = False
 
@@ -119,90 +207,84 @@ class GoProcessor:
                 else:
                     move = Move.pass_turn()
                 if first_move_done and point is not None:
-                    features[counter] = self.encoder.encode(game_state)
-                    labels[counter] = self.encoder.encode_point(point)
-                    counter += 1
+                    yield self.encoder.encode(game_state), self.encoder.encode_point(point)
                 game_state = game_state.apply_move(move)
                 first_move_done = True
 
-        labels = to_categorical(labels.astype(int), self.size * self.size)
-        print(choice(['done', 'done!', 'done!!!'])) # Make sure SOMETHING is happening.
-        return features, labels
-
-    def num_total_examples(self, filename):
-        total_examples = 0
-        sgf = open(filename, 'r')
-        sgf_content = sgf.read()
-        sgf.close()
-        sgf = Sgf_game.from_string(sgf_content)
-        if sgf.get_handicap() is not None and sgf.get_handicap() != 0:
-            return None
-        first_move_done = False
-        for item in sgf.main_sequence_iter():
-            color, move = item.get_move()
-            if color is not None:
-                if first_move_done:
-                    total_examples += 1
-                first_move_done = True
-        return total_examples
-
     def tf_record_from_nparrays(self, features, labels, record_file):
-        if not os.path.isdir(self.record_dir):
-            os.system('mkdir %s' %(self.record_dir))
+        tf = _tensorflow()
+        os.makedirs(self.record_dir, exist_ok=True)
         with tf.io.TFRecordWriter(record_file) as writer:
             for i in range(len(features)):
                 writer.write(self.tf_example_from_nparrays(features[i], labels[i]))
 
     def tf_example_from_nparrays(self, feature, label):
-        # Convert numpy arrays into string of TF Tensors.
-        feature = tf.convert_to_tensor(feature, dtype='float32')
-        feature = tf.io.serialize_tensor(feature)
-        label = tf.convert_to_tensor(label, dtype='int64')
-        label = tf.io.serialize_tensor(label)
-        # Dictionary for each example. Values transformed to tf.train features.
-        feature_dict = {
-            'feature': self._bytes_feature(feature),
-            'label': self._bytes_feature(label)
-        }
-        # Dictionary transformed to tf.train feature, then tf.train example.
-        item = tf.train.Features(feature=feature_dict)
-        example = tf.train.Example(features=item)
-        return example.SerializeToString() 
-
-    def _bytes_feature(self, value):
-      # Returns a bytes_list from a string / byte.
-      # BytesList won't unpack a string from an EagerTensor.
-      if isinstance(value, type(tf.constant(0))):
-          value = value.numpy()
-      return tf.train.Feature(bytes_list=tf.train.BytesList(value=[value]))
+        # The feature is stored as its raw little-endian bytes; its shape is
+        # fixed by the encoder, so read_tfrecords restores it. The label is
+        # a single point index. Called in the workers, so no TensorFlow.
+        return serialize_example({
+            'feature': np.asarray(feature, dtype='<f4').tobytes(),
+            'label': [int(label)],
+        })
 
     def get_dataset(self, batch_size=32, data_type='train'):
+        tf = _tensorflow()
         filenames = []
         for f in os.listdir(self.record_dir):
             if data_type in f:
                 filenames.append(self.record_dir+'/'+f)
         dataset = self.load_dataset(filenames)
         dataset = dataset.shuffle(250000)
+        # Examples are batched while still serialized and parsed a batch at
+        # a time.
+        dataset = dataset.batch(batch_size)
+        dataset = dataset.map(self.read_tfrecords, num_parallel_calls=tf.data.experimental.AUTOTUNE)
         dataset = dataset.prefetch(buffer_size=tf.data.experimental.AUTOTUNE)
+        return dataset
+
+    def get_sgf_dataset(self, sgf_files, batch_size=32):
+        # Like get_dataset, but games are encoded by the input pipeline while
+        # the model trains instead of ahead of time into TFRecords.
+        tf = _tensorflow()
+        signature = (tf.TensorSpec(self.encoder.shape(), tf.float32),
+                     tf.TensorSpec([], tf.int64))
+        dataset = tf.data.Dataset.from_tensor_slices(list(sgf_files))
+        dataset = dataset.shuffle(len(sgf_files))
+        dataset = dataset.interleave(
+            lambda f: tf.data.Dataset.from_generator(
+                lambda filename: self.samples(filename.decode()),
+                output_signature=signature, args=(f,)),
+            cycle_length=max(1, min(16, len(sgf_files))),
+            num_parallel_calls=tf.data.experimental.AUTOTUNE,
+            deterministic=False)
+        dataset = dataset.shuffle(10000)
         dataset = dataset.batch(batch_size)
+        dataset = dataset.prefetch(buffer_size=tf.data.experimental.AUTOTUNE)
         return dataset
 
     def load_dataset(self, filenames):
+        # Serialized examples, for read_tfrecords. Shards are read in
+        # parallel and their records interleaved.
+        tf = _tensorflow()
         ignore_order = tf.data.Options()
         ignore_order.experimental_deterministic = False
-        dataset = tf.data.TFRecordDataset(filenames)
+        dataset = tf.data.Dataset.from_tensor_slices(filenames)
+        dataset = dataset.shuffle(len(filenames))
+        dataset = dataset.interleave(lambda f: tf.data.TFRecordDataset(f, buffer_size=8 << 20),
+                                     cycle_length=max(1, min(16, len(filenames))),
+                                     num_parallel_calls=tf.data.experimental.AUTOTUNE,
+                                     deterministic=False)
         dataset = dataset.with_options(ignore_order)
-        dataset = dataset.map(partial(self.read_tfrecord), num_parallel_calls=tf.data.experimental.AUTOTUNE)
         return dataset
 
-    def read_tfrecord(self, example_proto):
+    def read_tfrecords(self, example_protos):
+        tf = _tensorflow()
         example_description = {
             'feature': tf.io.FixedLenFeature([], tf.string),
-            'label': tf.io.FixedLenFeature([], tf.string),
+            'label': tf.io.FixedLenFeature([], tf.int64),
         }
-        example = tf.io.parse_single_example(example_proto, example_description)
-        feature = tf.ensure_shape(tf.io.parse_tensor(example['feature'], 
-                                                     out_type='float32'), 
-                                                    [self.encoder.shape()[0],self.encoder.shape()[1],self.encoder.shape()[2]])
-        label = tf.ensure_shape(tf.io.parse_tensor(example['label'], out_type='int64'), [int(self.size*self.size)])
-        return feature, label
+        examples = tf.io.parse_example(example_protos, example_description)
+        # decode_raw turns the whole batch of byte strings into one tensor.
+        feature_shape = [-1,self.encoder.shape()[0],self.encoder.shape()[1],self.encoder.shape()[2]]
+        features = tf.reshape(tf.io.decode_raw(examples['feature'], tf.float32), feature_shape)
+        return features, examples['label']
@@ -1,5 +1,8 @@
 import os
-import glob
+import re
+import json
+import tarfile
+import urllib.request
 
 class SGFIndex:
     def __init__(self, size=19, url='https://homepages.cwi.nl/~aeb/go/games/games.tgz'):
@@ -12,15 +15,69 @@ class SGFIndex:
         self.index = []
 
     def download(self):
-        os.system('wget -c %s -O - | tar -xz' %(self.url))
+        # The archive is extracted into the working directory as it streams
+        # in. Members that would land outside it are refused.
+        with urllib.request.urlopen(self.url) as response:
+            with tarfile.open(fileobj=response, mode='r|gz') as archive:
+                if hasattr(tarfile, 'data_filter'):
+                    archive.extractall(filter='data')
+                else:
+                    # Pythons without extraction filters.
+                    for member in archive:
+                        self._check_member(member)
+                        archive.extract(member)
+
+    def _check_member(self, member):
+        for name in (member.name, member.linkname):
+            if os.path.isabs(name) or '..' in re.split(r'[\\/]', name):
+                raise tarfile.TarError('Refusing to extract %s' %(member.name))
 
     def create_index(self):
+        # The index is cached in raw_dir with the list of directories walked
+        # to build it, and reused while none of them has changed since.
+        cache = '%s/.sgf_index.size%d.json' %(self.raw_dir, self.size)
+        cached = self._read_cache(cache)
+        if cached is not None:
+            self.index = cached
+            return
+        self.index = []
+        directories = []
         if self.size!=19:
-            for filename in glob.iglob(self.raw_dir+'/'+'**/*.sgf', recursive=True):
-                if f"{self.size}x{self.size}" in filename:
+            keep = re.compile(re.escape(f"{self.size}x{self.size}")).search
+            for filename in self._sgf_files(self.raw_dir, directories):
+                if keep(filename):
                     self.index.append(filename)
         else:   
-            nonos = ['other_sizes','unusual','misc','training']
-            for filename in glob.iglob(self.raw_dir+'/'+'**/*.sgf', recursive=True):
-                if not any(nono in filename for nono in nonos):
+            nonos = re.compile('other_sizes|unusual|misc|training').search
+            for filename in self._sgf_files(self.raw_dir, directories):
+                if not nonos(filename):
                     self.index.append(filename)
+        with open(cache, 'w') as f:
+            json.dump({'directories': directories, 'index': self.index}, f)
+
+    def _read_cache(self, cache):
+        # The cached index, or None if there is none or it is stale. Adding,
+        # removing or renaming a file or a subdirectory updates the mtime of
+        # the directory holding it, so one stat per walked directory finds
+        # any change to the set of files.
+        if not os.path.isfile(cache):
+            return None
+        written = os.path.getmtime(cache)
+        with open(cache) as f:
+            cached = json.load(f)
+        for directory in cached['directories']:
+            if not os.path.isdir(directory) or os.path.getmtime(directory) > written:
+                return None
+        return cached['index']
+
+    def _sgf_files(self, directory, directories):
+        # Every .sgf file under directory, found with os.scandir; each
+        # directory walked is added to directories. Symlinked directories
+        # are not followed, so a link loop cannot recurse forever.
+        directories.append(directory)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._sgf_files(entry.path, directories)
+                elif entry.name.endswith('.sgf'):
+                    yield entry.path
@@ -1,9 +1,17 @@
 from gostuff.encoders.base import Encoder
 from gostuff.gotypes import Point, Player
 from gostuff.goboard import Move
-from gostuff.agents.helpers import is_point_an_eye
 import numpy as np
 
+# numba is optional; without it the move-plane kernel runs as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Channel 0 represents the current player's stone color.
 # Channel 1 represents how many turns ago each stone was placed.
 # Channel 2 represents black and white eyes.
@@ -14,78 +22,170 @@ import numpy as np
 # Channel 7 represents number of own stones in atari if played.
 # Channel 8 represents number of opponent stones captured if played.
 
+# Marks off-board cells in the padded stone grid used for eyes.
+OFF_BOARD = 2
+
+def eye_mask(stones, color):
+    # Empty points whose neighbours are all color's stones and whose
+    # diagonals are mostly color's too (all of them on the edge), as in
+    # agents.helpers.is_point_an_eye, for the whole board at once.
+    height, width = stones.shape
+    padded = np.pad(stones, 1, constant_values=OFF_BOARD)
+    def shifted(dr, dc):
+        return padded[1 + dr:height + 1 + dr, 1 + dc:width + 1 + dc]
+    eyes = stones == 0
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        neighbor = shifted(dr, dc)
+        eyes &= (neighbor == color) | (neighbor == OFF_BOARD)
+    corners = [shifted(dr, dc) for dr in (-1, 1) for dc in (-1, 1)]
+    off_board = sum((corner == OFF_BOARD).astype(np.int8) for corner in corners)
+    friendly = sum((corner == color).astype(np.int8) for corner in corners)
+    eyes &= np.where(off_board > 0, off_board + friendly == 4, friendly >= 3)
+    return eyes
+
+@njit(cache=True)
+def move_counts(stones, string_id, liberties, player, neighbors):
+    # For every empty point where player (1 black, -1 white) can play, ko
+    # aside: the liberties of the resulting string, its stones if that
+    # leaves it in atari, and the opponent stones captured, counting a
+    # string once per side it touches the point on, as the models were
+    # trained with. Also returns the points whose move captures. neighbors
+    # holds the flat indices of each point's neighbours, -1 past the edge.
+    height, width = stones.shape
+    n = height * width
+    colors = stones.ravel()
+    ids = string_id.ravel()
+    libs = liberties.ravel()
+    num_strings = ids.max() + 1
+    # The stones of each string, grouped by id: string k's stones are
+    # members[start[k]:start[k + 1]].
+    start = np.zeros(num_strings + 1, np.int64)
+    string_libs = np.zeros(num_strings, np.int64)
+    for i in range(n):
+        if ids[i] >= 0:
+            start[ids[i] + 1] += 1
+            string_libs[ids[i]] = libs[i]
+    for k in range(num_strings):
+        start[k + 1] += start[k]
+    members = np.empty(n, np.int64)
+    filled = start[:-1].copy()
+    for i in range(n):
+        if ids[i] >= 0:
+            members[filled[ids[i]]] = i
+            filled[ids[i]] += 1
+
+    counts = np.zeros((height, width, 3), np.int64)
+    captures = np.zeros((height, width), np.bool_)
+    # stamp[q] == tick marks q as already counted for the current point.
+    stamp = np.zeros(n, np.int64)
+    tick = 0
+    merged = np.empty(4, np.int64)
+    captured = np.empty(4, np.int64)
+    for p in range(n):
+        if colors[p] != 0:
+            continue
+        num_merged = 0
+        num_captured = 0
+        capture_count = 0
+        for q in neighbors[p]:
+            if q < 0 or colors[q] == 0:
+                continue
+            k = ids[q]
+            if colors[q] == player:
+                if not _contains(merged, num_merged, k):
+                    merged[num_merged] = k
+                    num_merged += 1
+            elif string_libs[k] == 1:
+                capture_count += start[k + 1] - start[k]
+                if not _contains(captured, num_captured, k):
+                    captured[num_captured] = k
+                    num_captured += 1
+
+        # The new string's liberties: points next to it that are empty now
+        # or freed by the capture.
+        tick += 1
+        stamp[p] = tick
+        num_liberties = _count_liberties(p, colors, ids, neighbors, captured,
+                                         num_captured, stamp, tick)
+        num_stones = 1
+        for m in range(num_merged):
+            k = merged[m]
+            num_stones += start[k + 1] - start[k]
+            for i in range(start[k], start[k + 1]):
+                num_liberties += _count_liberties(members[i], colors, ids, neighbors,
+                                                  captured, num_captured, stamp, tick)
+        if num_liberties == 0:
+            continue
+        row = p // width
+        col = p % width
+        counts[row, col, 0] = num_liberties
+        if num_liberties == 1:
+            counts[row, col, 1] = num_stones
+        counts[row, col, 2] = capture_count
+        captures[row, col] = num_captured > 0
+    return counts, captures
+
+@njit(cache=True)
+def _contains(values, count, value):
+    for i in range(count):
+        if values[i] == value:
+            return True
+    return False
+
+@njit(cache=True)
+def _count_liberties(p, colors, ids, neighbors, captured, num_captured,
+                     stamp, tick):
+    # Liberties next to stone p not counted yet for this tick.
+    count = 0
+    for q in neighbors[p]:
+        if q < 0 or stamp[q] == tick:
+            continue
+        if colors[q] == 0 or _contains(captured, num_captured, ids[q]):
+            stamp[q] = tick
+            count += 1
+    return count
+
 class GoGoBoi(Encoder):
     def __init__(self, board_size):
         self.board_width, self.board_height = board_size
         self.num_planes = 9
+        # Flat indices of each point's neighbours, -1 past the edge, for
+        # move_counts.
+        rows, cols = np.divmod(np.arange(self.board_height * self.board_width), self.board_width)
+        self._neighbors = np.full((self.board_height * self.board_width, 4), -1, dtype=np.int64)
+        for j, (dr, dc) in enumerate(((-1, 0), (1, 0), (0, -1), (0, 1))):
+            on_board = (0 <= rows + dr) & (rows + dr < self.board_height) & \
+                (0 <= cols + dc) & (cols + dc < self.board_width)
+            self._neighbors[on_board, j] = ((rows + dr) * self.board_width + cols + dc)[on_board]
 
     def name(self):
         return 'gogoboi'
 
     def encode(self, game_state):
-        board_tensor = np.zeros(self.shape())        
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-                p = Point(row=row + 1, col=col + 1)
-                go_string = game_state.board.get_go_string(p)
-                move = Move.play(p)
-
-                if game_state.next_player == Player.black:
-                    board_tensor[row][col][0] = 1
-                else:
-                    board_tensor[row][col][0] = -1
-
-                if game_state.board.move_ages.move_ages[row][col] < 10:
-                    board_tensor[row][col][1] = game_state.board.move_ages.move_ages[row][col] / 10
-                else:
-                    board_tensor[row][col][1] = 1
-
-                if is_point_an_eye(game_state.board, p, Player.black):    
-                    board_tensor[row][col][2] = 1
-                if is_point_an_eye(game_state.board, p, Player.white):
-                    board_tensor[row][col][2] = -1
-                                                                                    
-                if not go_string:
-                    if game_state.does_move_violate_ko(game_state.next_player,
-                                                       move):
-                        board_tensor[row][col][3] = 1               
-
-                if go_string:                                            
-                    if go_string.color == Player.black:
-                        board_tensor[row][col][4] = 1
-                    else:
-                        board_tensor[row][col][4] = -1
-                    
-                    if go_string.num_liberties < 10:
-                        board_tensor[row][col][5] = go_string.num_liberties / 10
-                    else:
-                        board_tensor[row][col][5] = 1
-                
-                if game_state.is_valid_move(move):
-                      new_state = game_state.apply_move(move, sim=True)
-                      new_string = new_state.board.get_go_string(p)
-                      if new_string.num_liberties < 10:
-                        board_tensor[row][col][6] = new_string.num_liberties / 10
-                      else:
-                          board_tensor[row][col][6] = 1
-                      
-                      if new_string.num_liberties == 1:
-                          if len(new_string.stones) < 10:                      
-                              board_tensor[row][col][7] = len(new_string.stones) / 10
-                          else:
-                              board_tensor[row][col][7] = 1
-
-                      adjacent_strings = [game_state.board.get_go_string(nb)  
-                                        for nb in p.neighbors()]            #<8>
-                      capture_count = 0
-                      for s in adjacent_strings:
-                          other_p = game_state.next_player.other
-                          if s and s.num_liberties == 1 and s.color == other_p:
-                              capture_count += len(s.stones)
-                      if capture_count < 10:                   
-                          board_tensor[row][col][8] = capture_count / 10
-                      else:             
-                          board_tensor[row][col][8] = 1
+        board = game_state.board
+        board_tensor = np.zeros(self.shape(), dtype=np.float32)
+        # Channels 0-2, 4 and 5 are whole-board array ops over a snapshot
+        # of the board.
+        stones, liberties, string_id = board.snapshot()
+        board_tensor[:, :, 0] = 1 if game_state.next_player == Player.black else -1
+        board_tensor[:, :, 1] = np.minimum(board.move_ages.move_ages, 10) / 10
+        board_tensor[:, :, 2] = np.where(eye_mask(stones, -1), -1,
+                                         eye_mask(stones, 1).astype(np.int8))
+        board_tensor[:, :, 4] = stones
+        board_tensor[:, :, 5] = np.minimum(liberties, 10) / 10
+
+        # Channels 6-8 come from one compiled pass over the empty points. Only
+        # capturing moves can be ko, so only those get the ko check here.
+        player = game_state.next_player
+        counts, captures = move_counts(
+            stones, string_id, liberties, 1 if player == Player.black else -1,
+            self._neighbors)
+        if not game_state.is_over():
+            board_tensor[:, :, 6:] = np.minimum(counts, 10) / 10
+        for row, col in np.argwhere(captures).tolist():
+            if game_state.does_move_violate_ko(player, Move.play(Point(row=row + 1, col=col + 1))):
+                board_tensor[row, col, 3] = 1
+                board_tensor[row, col, 6:] = 0
 
         return board_tensor
 
@@ -104,4 +204,4 @@ class GoGoBoi(Encoder):
         return self.board_height, self.board_width, self.num_planes
 
 def create(board_size):
-    return GoGoBoi(board_size)
\ No newline at end of file
+    return GoGoBoi(board_size)
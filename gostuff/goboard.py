@@ -1,4 +1,5 @@
 import copy
+import numpy as np
 from gostuff.gotypes import Player, Point
 from gostuff.scoring import compute_game_result
 from gostuff import zobrist
@@ -94,7 +95,7 @@ class Board():
         self.num_rows = num_rows
         self.num_cols = num_cols
         self._grid = {}
-        self._hash = zobrist.EMPTY_BOARD
+        self._hash = int(zobrist.EMPTY_BOARD)
 
         global neighbor_tables
         dim = (num_rows, num_cols)
@@ -143,8 +144,7 @@ class Board():
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
 
-        self._hash ^= zobrist.HASH_CODE[point, None]
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._hash ^= zobrist.TOGGLE_TUPLE[((point.row - 1) * 19 + point.col - 1) * 3 + player.value]
 
         for other_color_string in adjacent_opposite_color:
             replacement = other_color_string.without_liberty(point)
@@ -158,6 +158,8 @@ class Board():
             self._grid[point] = new_string
 
     def _remove_string(self, string, sim=False):
+        toggles = zobrist.TOGGLE_TUPLE
+        color_id = string.color.value
         for point in string.stones:
             if not sim:
                 self.move_ages.reset_age(point)
@@ -168,8 +170,7 @@ class Board():
                 if neighbor_string is not string:
                     self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
-            self._hash ^= zobrist.HASH_CODE[point, None]
+            self._hash ^= toggles[((point.row - 1) * 19 + point.col - 1) * 3 + color_id]
 
     def is_self_capture(self, player, point):
         friendly_strings = []
@@ -229,6 +230,31 @@ class Board():
     def zobrist_hash(self):
         return self._hash
 
+    def snapshot(self):
+        # The board as arrays indexed [row - 1, col - 1]: stone colours (1
+        # black, -1 white, 0 empty), the liberty count of the string through
+        # each stone, and an id per string (-1 on empty points).
+        stones = np.zeros((self.num_rows, self.num_cols), dtype=np.int8)
+        liberties = np.zeros((self.num_rows, self.num_cols), dtype=np.int16)
+        string_id = np.full((self.num_rows, self.num_cols), -1, dtype=np.int32)
+        ids = {}
+        for point, string in self._grid.items():
+            if string is None:
+                continue
+            row, col = point.row - 1, point.col - 1
+            stones[row, col] = 1 if string.color == Player.black else -1
+            liberties[row, col] = string.num_liberties
+            string_id[row, col] = ids.setdefault(id(string), len(ids))
+        return stones, liberties, string_id
+
+    def canonical_hash(self):
+        # The same for all 8 rotations and reflections of the position, for
+        # keying transposition tables. Square boards only.
+        assert self.num_rows == self.num_cols
+        codes = [zobrist.code_index(point, string.color.value)
+                 for point, string in self._grid.items() if string is not None]
+        return zobrist.canonical_hash(self.num_rows, codes)
+
 class Move():
     def __init__(self, point=None, is_pass=False, is_resign=False):
         assert (point is not None) ^ is_pass ^ is_resign
@@ -56,6 +56,10 @@ class MoveAge():
         # Stone removed.
         self.move_ages[point.row - 1, point.col - 1] = 0
 
+    def increment_all(self):
+        # A move was played; every stone on the board gets one move older.
+        self.move_ages[self.move_ages > 0] += 1
+
     def add(self, point):
         # New stone.
         self.move_ages[point.row - 1, point.col - 1] = 1
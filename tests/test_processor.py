@@ -0,0 +1,58 @@
+import pytest
+
+from gostuff.data.processor import GoProcessor, serialize_example
+
+# Black and white alternate with one pass; every play after the first is
+# a sample.
+SGF = '(;GM[1]FF[4]SZ[9];B[ee];W[cc];B[gc];W[];B[cg];W[dd])'
+NUM_SAMPLES = 4
+
+
+@pytest.fixture
+def sgf_file(tmp_path):
+    path = tmp_path / 'game.sgf'
+    path.write_text(SGF)
+    return str(path)
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return GoProcessor(size=9, record_directory=str(tmp_path / 'records'))
+
+
+def test_samples(processor, sgf_file):
+    samples = list(processor.samples(sgf_file))
+    assert len(samples) == NUM_SAMPLES
+    for feature, label in samples:
+        assert feature.shape == processor.encoder.shape()
+        assert 0 <= label < processor.encoder.num_points()
+    assert len({label for _, label in samples}) == NUM_SAMPLES
+
+
+def test_get_sgf_dataset_yields_a_batch(processor, sgf_file):
+    tf = pytest.importorskip('tensorflow')
+    dataset = processor.get_sgf_dataset([sgf_file], batch_size=NUM_SAMPLES)
+    features, labels = next(iter(dataset))
+    assert features.shape == (NUM_SAMPLES,) + processor.encoder.shape()
+    assert features.dtype == tf.float32
+    assert labels.shape == (NUM_SAMPLES,)
+    assert labels.dtype == tf.int64
+
+
+def test_examples_parse_as_tf_train_examples(processor, sgf_file):
+    tf = pytest.importorskip('tensorflow')
+    for feature, label in processor.samples(sgf_file):
+        example = tf.train.Example.FromString(
+            processor.tf_example_from_nparrays(feature, label))
+        expected = tf.train.Example(features=tf.train.Features(feature={
+            'feature': tf.train.Feature(bytes_list=tf.train.BytesList(
+                value=[feature.astype('<f4').tobytes()])),
+            'label': tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+        }))
+        assert example == expected
+
+
+def test_serialize_example_negative_int64():
+    tf = pytest.importorskip('tensorflow')
+    example = tf.train.Example.FromString(serialize_example({'label': [-3, 0, 1 << 40]}))
+    assert list(example.features.feature['label'].int64_list.value) == [-3, 0, 1 << 40]
@@ -0,0 +1,143 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from gostuff import goboard as reference
+from gostuff import scoring as reference_scoring
+from gostuff.gotypes import Player as ReferencePlayer, Point as ReferencePoint
+from tmcode import board as tm
+from tmcode import playout
+
+# TMtests' board, its compiled scans and the compiled playout are checked
+# against gostuff.goboard, the straightforward implementation of the same
+# rules: no self-capture, situational superko and area scoring.
+
+TO_TM = {None: None, ReferencePlayer.black: tm.BLACK, ReferencePlayer.white: tm.WHITE}
+
+
+def _random_games(size, seeds, max_moves=150):
+    # Random games played on both implementations in lockstep. Yields the
+    # pair of states before every move and once more at the end.
+    for seed in seeds:
+        rng = random.Random(seed)
+        game = tm.GameState.new_game(size, komi=None)
+        ref_game = reference.GameState.new_game(size)
+        for _ in range(max_moves):
+            yield game, ref_game
+            if game.is_over():
+                break
+            moves = [move for move in game.legal_moves() if move.is_play]
+            if moves and rng.random() < 0.95:
+                move = rng.choice(moves)
+                ref_move = reference.Move.play(ReferencePoint(*move.point))
+            else:
+                move = tm.Move.pass_turn()
+                ref_move = reference.Move.pass_turn()
+            game = game.apply_move(move)
+            ref_game = ref_game.apply_move(ref_move, sim=True)
+
+
+def _play_points(moves):
+    return {tuple(move.point) for move in moves if move.is_play}
+
+
+def _points(size):
+    return [tm.Point(row, col) for row in range(1, size + 1) for col in range(1, size + 1)]
+
+
+@pytest.mark.parametrize('size', [5, 7])
+def test_legal_moves_and_captures_match_reference(size):
+    ko_positions = 0
+    for game, ref_game in _random_games(size, seeds=range(6)):
+        for point in _points(size):
+            assert game.board.get(point) == TO_TM[ref_game.board.get(ReferencePoint(*point))]
+        legal = _play_points(game.legal_moves())
+        assert legal == _play_points(ref_game.legal_moves())
+        # Points that are playable but for ko.
+        playable, _ = game.playable_mask()
+        if np.count_nonzero(playable) > len(legal):
+            ko_positions += 1
+    assert ko_positions > 0
+
+
+def test_simple_ko():
+    # Black takes the ko at (2, 2); White may not retake at once, but may
+    # after a move elsewhere by each side.
+    setup = [
+        ('b', 1, 2), ('b', 2, 1), ('b', 3, 2),
+        ('w', 2, 2), ('w', 1, 3), ('w', 3, 3), ('w', 2, 4),
+    ]
+    game = tm.GameState.new_game(5, komi=None)
+    ref_game = reference.GameState.new_game(5)
+    for color, row, col in setup:
+        player = tm.BLACK if color == 'b' else tm.WHITE
+        game.board.place_stone(player, tm.Point(row, col))
+        ref_player = ReferencePlayer.black if color == 'b' else ReferencePlayer.white
+        ref_game.board.place_stone(ref_player, ReferencePoint(row, col), sim=True)
+    game = game.apply_move(tm.Move.play(tm.Point(2, 3)))
+    ref_game = ref_game.apply_move(reference.Move.play(ReferencePoint(2, 3)), sim=True)
+    assert game.board.get(tm.Point(2, 2)) is None
+
+    retake = tm.Move.play(tm.Point(2, 2))
+    assert game.does_move_violate_ko(tm.WHITE, retake)
+    assert not game.is_valid_move(retake)
+    assert not ref_game.is_valid_move(reference.Move.play(ReferencePoint(2, 2)))
+
+    for point in (tm.Point(5, 1), tm.Point(4, 1)):
+        game = game.apply_move(tm.Move.play(point))
+    assert game.is_valid_move(retake)
+
+
+@pytest.mark.parametrize('size', [5, 9])
+def test_scores_match_reference(size):
+    for game, ref_game in _random_games(size, seeds=range(4), max_moves=2000):
+        pass
+    assert game.is_over()
+    result = tm.compute_game_result(game, komi=0)
+    ref_result = reference_scoring.compute_game_result(ref_game, komi=0)
+    assert (result.b, result.w) == (ref_result.b, ref_result.w)
+
+
+@pytest.mark.parametrize('size', [5, 9])
+def test_playout_kernels_match_board(size):
+    dim = (size, size)
+    stride = size + 2
+    toggles = np.frombuffer(tm.bit_tables[dim][7], dtype=np.uint64)
+    n = (size + 2) * stride
+    mark = np.zeros(n, np.int64)
+    stamp = np.zeros(1, np.int64)
+    visited = np.zeros(n, np.uint8)
+    stack = np.empty(n, np.int64)
+    region = np.empty(n, np.int64)
+    buffers = (mark, stamp, visited, stack, region)
+    for game, _ in _random_games(size, seeds=range(2)):
+        board = game.board
+        colors = board.colors()
+        h = np.uint64(board.zobrist_hash())
+        for point in _points(size):
+            if board.get(point) is not None:
+                continue
+            idx = board.index(point)
+            for player in (tm.BLACK, tm.WHITE):
+                self_capture = playout.is_self_capture(
+                    colors, stride, idx, player, mark, stamp, stack)
+                assert self_capture == board.is_self_capture(player, point)
+                if self_capture:
+                    continue
+                next_h, captures = playout.hash_after(
+                    colors, stride, idx, player, h, toggles, buffers)
+                assert int(next_h) == board.hash_after(player, point)
+                assert captures == board.will_capture(player, point)
+
+                played = colors.copy()
+                played_h = playout.play(played, stride, idx, player, h, toggles, buffers)
+                expected = copy.deepcopy(board)
+                expected.place_stone(player, point)
+                assert int(played_h) == expected.zobrist_hash()
+                assert np.array_equal(played, expected.colors())
+        territory = tm.evaluate_territory(board)
+        assert playout.area_score(colors, stride) == (
+            territory.num_black_territory + territory.num_black_stones,
+            territory.num_white_territory + territory.num_white_stones)
@@ -0,0 +1,54 @@
+import random
+
+from gostuff.goboard import Board
+from gostuff.gotypes import Player, Point
+
+
+def _symmetries(size):
+    s = size + 1
+    return [
+        lambda r, c: (r, c),
+        lambda r, c: (c, s - r),
+        lambda r, c: (s - r, s - c),
+        lambda r, c: (s - c, r),
+        lambda r, c: (r, s - c),
+        lambda r, c: (s - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (s - c, s - r),
+    ]
+
+
+def _random_stones(size, count, seed):
+    rng = random.Random(seed)
+    points = [(r, c) for r in range(1, size + 1) for c in range(1, size + 1)]
+    return [(rng.choice([Player.black, Player.white]), point)
+            for point in rng.sample(points, count)]
+
+
+def test_canonical_hash_is_int():
+    board = Board(9, 9)
+    board.place_stone(Player.black, Point(3, 4), sim=True)
+    assert type(board.canonical_hash()) is int
+
+
+def test_canonical_hash_matches_across_symmetries():
+    for size in (9, 13, 19):
+        # Sparse enough that nothing is captured, so every image holds
+        # exactly the transformed stones.
+        stones = _random_stones(size, size, seed=size)
+        keys = set()
+        for transform in _symmetries(size):
+            board = Board(size, size)
+            for player, (row, col) in stones:
+                point = Point(*transform(row, col))
+                board.place_stone(player, point, sim=True)
+            keys.add(board.canonical_hash())
+        assert len(keys) == 1
+
+
+def test_canonical_hash_tells_positions_apart():
+    first = Board(9, 9)
+    first.place_stone(Player.black, Point(3, 3), sim=True)
+    second = Board(9, 9)
+    second.place_stone(Player.black, Point(3, 4), sim=True)
+    assert first.canonical_hash() != second.canonical_hash()